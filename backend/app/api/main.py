@@ -1,13 +1,17 @@
-from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi import FastAPI, HTTPException, Depends, Query, Header, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, List, Optional
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import TYPE_CHECKING, Dict, List, Optional
 import logging
 import json
 
-from app.models.book import Book, BookSearchParams
+from app.models.book import Book, BookChange, BookChangeFeed, BookSearchParams
 from app.models.headline import Headline
 from app.core.redis import RedisService
-from app.services.scrape_books import BookScraper
+
+if TYPE_CHECKING:
+    from app.services.scrape_books import BookScraper
 
 
 # Configuración de logging
@@ -30,20 +34,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Changes-Cursor"],
 )
 
+# Formato de los IDs de Redis Streams (p. ej. 1700000000000-0)
+STREAM_ID_PATTERN = r"^\d+(-\d+)?$"
+
 # Dependencias
 def get_redis_service():
     return RedisService()
 
-def get_book_scraper_service():
+def get_book_scraper_service() -> "BookScraper":
+    # Import diferido: los workers de solo lectura no cargan requests ni bs4
+    from app.services.scrape_books import BookScraper
     return BookScraper()
 
 
 @app.post("/init", response_model=dict)
 async def init_scraping(
     redis_service: RedisService = Depends(get_redis_service),
-    book_scraper: BookScraper = Depends(get_book_scraper_service)
+    book_scraper: "BookScraper" = Depends(get_book_scraper_service)
 ):
     """
     Inicia el scraping inicial de libros y los almacena en Redis.
@@ -53,15 +63,20 @@ async def init_scraping(
         logger.info("Iniciando scraping de libros...")
         books = book_scraper.scrape_books(max_books_per_category=20, max_price=20.0)
         logger.info(f"Terminado scraping de libros...{books}")
+        if not books:
+            # Un scraping fallido no debe vaciar el catálogo
+            raise HTTPException(
+                status_code=502,
+                detail="El scraping no devolvió libros; se conserva el catálogo actual"
+            )
         # Almacenar libros en Redis
-        for idx, book in enumerate(books):
-            book_with_id = book
-            book_with_id['id'] = str(idx)
-            redis_service.set_book(str(idx), book_with_id)
-        
-        logger.info(f"Scraping completado. {len(books)} libros almacenados en Redis.")
+        stored = redis_service.store_books(books, categories=book_scraper.scraped_categories)
+
+        logger.info(f"Scraping completado. {stored} libros almacenados en Redis.")
         
-        return {"status": "success", "message": f"{len(books)} libros scrapeados y almacenados"}
+        return {"status": "success", "message": f"{stored} libros scrapeados y almacenados"}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error durante el scraping inicial: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error durante el scraping: {str(e)}")
@@ -89,16 +104,95 @@ async def search_books(
         logger.error(f"Error al buscar libros: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error al buscar libros: {str(e)}")
 
+@app.get("/books/changes", response_model=BookChangeFeed)
+async def get_book_changes(
+    since: Optional[str] = Query(None, pattern=STREAM_ID_PATTERN),
+    limit: int = Query(500, ge=1, le=5000),
+    redis_service: RedisService = Depends(get_redis_service)
+):
+    """
+    Devuelve los cambios del catálogo posteriores al cursor `since`.
+    Sin `since` solo devuelve el cursor actual.
+    """
+    try:
+        if since is None:
+            return {"events": [], "last_id": redis_service.get_changes_cursor(), "reset": False}
+        return redis_service.get_changes(since, limit=limit)
+    except Exception as e:
+        logger.error(f"Error al obtener cambios: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error al obtener cambios: {str(e)}")
+
+def format_change_event(event: dict) -> str:
+    """Serializa un cambio del catálogo como server-sent event."""
+    return f"id: {event['id']}\ndata: {BookChange(**event).model_dump_json()}\n\n"
+
+@app.get("/books/changes/stream")
+async def stream_book_changes(
+    request: Request,
+    since: Optional[str] = Query(None, pattern=STREAM_ID_PATTERN),
+    last_event_id: Optional[str] = Header(None, pattern=STREAM_ID_PATTERN),
+    redis_service: RedisService = Depends(get_redis_service)
+):
+    """
+    Emite los cambios del catálogo como server-sent events. Al reconectar,
+    el navegador envía Last-Event-ID y se continúa desde ese evento.
+    """
+    try:
+        cursor = last_event_id or since or await run_in_threadpool(redis_service.get_changes_cursor)
+    except Exception as e:
+        logger.error(f"Error al abrir el stream de cambios: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error al abrir el stream de cambios: {str(e)}")
+
+    async def event_stream():
+        last_id = cursor
+        try:
+            # Ponerse al día con los cambios pendientes antes de esperar nuevos.
+            # Cada página es una lectura corta: se hace en el threadpool para no bloquear el loop
+            while True:
+                feed = await run_in_threadpool(redis_service.get_changes, last_id)
+                if feed["reset"]:
+                    last_id = feed["last_id"]
+                    yield f"id: {last_id}\nevent: reset\ndata: {{}}\n\n"
+                    break
+                for event in feed["events"]:
+                    yield format_change_event(event)
+                last_id = feed["last_id"]
+                if not feed["events"]:
+                    break
+
+            # La espera usa redis.asyncio: no ocupa un hilo del threadpool por cliente
+            while not await request.is_disconnected():
+                events = await redis_service.wait_for_changes(last_id)
+                if not events:
+                    # Comentario SSE para mantener viva la conexión
+                    yield ": keepalive\n\n"
+                    continue
+                for event in events:
+                    yield format_change_event(event)
+                last_id = events[-1]["id"]
+        finally:
+            await redis_service.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/books", response_model=List[Book])
 async def get_books(
+    response: Response,
     category: Optional[str] = None,
     redis_service: RedisService = Depends(get_redis_service)
 ):
     """
     Obtiene libros de Redis, con filtrado opcional por categoría.
+    La cabecera X-Changes-Cursor indica desde qué cambio seguir el catálogo.
     """
        
     try:
+        # Leer el cursor antes que los libros para no perder cambios intermedios
+        response.headers["X-Changes-Cursor"] = redis_service.get_changes_cursor()
         if category:
             books = redis_service.get_books_by_category(category)
             return books
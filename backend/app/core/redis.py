@@ -1,21 +1,41 @@
+import hashlib
 import json
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Set
 from redis import Redis
+from redis.exceptions import WatchError
+from redis.asyncio import Redis as AsyncRedis
+from redis.client import Pipeline
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Stream con los cambios del catálogo (added/updated/removed)
+BOOK_CHANGES_STREAM = "books:changes"
+# Conjunto con los IDs de los libros gestionados por store_books
+BOOK_IDS_KEY = "books:ids"
+# ID del último evento descartado al recortar el stream
+BOOK_CHANGES_TRIMMED_KEY = "books:changes:trimmed"
+# Número de eventos que se conservan en el stream
+BOOK_CHANGES_MAXLEN = int(os.getenv('BOOK_CHANGES_MAXLEN', '10000'))
+
+
+def _parse_stream_id(stream_id: str) -> tuple:
+    ms, _, seq = stream_id.partition('-')
+    return int(ms), int(seq or 0)
+
+
 class RedisService:
     def __init__(self):
-        redis_host = os.getenv('REDIS_HOST', 'recruiter-dev-redis')
-        redis_port = int(os.getenv('REDIS_PORT', '6379'))
+        self.redis_host = os.getenv('REDIS_HOST', 'recruiter-dev-redis')
+        self.redis_port = int(os.getenv('REDIS_PORT', '6379'))
         self.redis_client = Redis(
-            host=redis_host,
-            port=redis_port,
+            host=self.redis_host,
+            port=self.redis_port,
             decode_responses=True,
             socket_connect_timeout=3
         )
+        self._async_redis_client: Optional[AsyncRedis] = None
 
     def set_book(self, book_id: str, book_data: Dict[str, Any]) -> bool:
         """Almacena un libro en Redis."""
@@ -25,6 +45,173 @@ class RedisService:
             print(f"Error al almacenar libro: {str(e)}")
             return False
 
+    @staticmethod
+    def generate_book_id(title: str, category: str) -> str:
+        """
+        ID estable de un libro, derivado de su categoría y su título. Dos libros
+        con el mismo título en la misma categoría comparten ID: solo se guarda
+        el último.
+        """
+        return hashlib.md5(f"{category}:{title}".encode()).hexdigest()
+
+    @staticmethod
+    def _catalog_ids(pipe: Pipeline) -> Set[str]:
+        """IDs del catálogo; si aún no hay índice, se reconstruye a partir de las claves book:*."""
+        ids = pipe.smembers(BOOK_IDS_KEY)
+        if not ids:
+            ids = {key.split(':', 1)[1] for key in pipe.scan_iter("book:*")}
+        return ids
+
+    def store_books(self, books: List[Dict[str, Any]],
+                    categories: Optional[Iterable[str]] = None) -> int:
+        """
+        Guarda los libros scrapeados y registra en el stream de cambios los
+        libros añadidos, modificados y eliminados. Solo se eliminan libros de
+        las categorías scrapeadas (`categories`, por defecto las de `books`).
+
+        La lectura del catálogo, la comparación y la escritura se hacen bajo
+        WATCH, así que ingestas concurrentes no generan eventos contradictorios.
+        Devuelve el número de libros distintos almacenados.
+        """
+        if not books:
+            raise ValueError("El scraping no devolvió libros; no se modifica el catálogo")
+
+        catalog = {}
+        for book in books:
+            book_id = self.generate_book_id(book['title'], book['category'])
+            catalog[book_id] = {**book, 'id': book_id}
+        scraped_categories = set(categories) if categories is not None else {
+            book['category'] for book in catalog.values()
+        }
+
+        with self.redis_client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(BOOK_IDS_KEY)
+                    previous_ids = self._catalog_ids(pipe)
+                    ids = list(set(catalog) | previous_ids)
+                    keys = [f"book:{book_id}" for book_id in ids]
+                    pipe.watch(*keys)
+                    previous = {
+                        book_id: json.loads(data)
+                        for book_id, data in zip(ids, pipe.mget(keys)) if data
+                    }
+
+                    pipe.multi()
+                    for book_id, book in catalog.items():
+                        if previous.get(book_id) == book:
+                            continue
+                        pipe.set(f"book:{book_id}", json.dumps(book))
+                        self._append_change(
+                            pipe, 'added' if book_id not in previous else 'updated', book_id, book
+                        )
+                    pipe.sadd(BOOK_IDS_KEY, *catalog)
+                    for book_id in previous_ids - set(catalog):
+                        book = previous.get(book_id)
+                        if book and book.get('category') not in scraped_categories:
+                            continue
+                        pipe.delete(f"book:{book_id}")
+                        pipe.srem(BOOK_IDS_KEY, book_id)
+                        if book:
+                            self._append_change(pipe, 'removed', book_id)
+                    pipe.execute()
+                    break
+                except WatchError:
+                    # Otra ingesta modificó el catálogo entre la lectura y la escritura
+                    continue
+
+        self._trim_changes()
+        return len(catalog)
+
+    @staticmethod
+    def _append_change(pipe: Pipeline, change_type: str, book_id: str,
+                       book: Optional[Dict[str, Any]] = None):
+        """Añade un evento al stream de cambios del catálogo dentro de `pipe`."""
+        fields = {"type": change_type, "book_id": book_id}
+        if book is not None:
+            fields["book"] = json.dumps(book)
+        pipe.xadd(BOOK_CHANGES_STREAM, fields)
+
+    def _trim_changes(self):
+        """
+        Recorta el stream a BOOK_CHANGES_MAXLEN eventos y guarda el ID del último
+        evento descartado, para saber qué cursores se han quedado sin historia.
+        """
+        with self.redis_client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(BOOK_CHANGES_STREAM)
+                    excess = pipe.xlen(BOOK_CHANGES_STREAM) - BOOK_CHANGES_MAXLEN
+                    if excess <= 0:
+                        return
+                    entries = pipe.xrange(BOOK_CHANGES_STREAM, count=excess + 1)
+                    pipe.multi()
+                    pipe.set(BOOK_CHANGES_TRIMMED_KEY, entries[excess - 1][0])
+                    pipe.xtrim(BOOK_CHANGES_STREAM, minid=entries[excess][0], approximate=False)
+                    pipe.execute()
+                    return
+                except WatchError:
+                    continue
+
+    @staticmethod
+    def _format_change(entry_id: str, fields: Dict[str, str]) -> Dict[str, Any]:
+        return {
+            "id": entry_id,
+            "type": fields.get("type"),
+            "book_id": fields.get("book_id"),
+            "book": json.loads(fields["book"]) if fields.get("book") else None
+        }
+
+    def get_changes_cursor(self) -> str:
+        """Devuelve el ID del último evento del stream ("0" si está vacío)."""
+        entries = self.redis_client.xrevrange(BOOK_CHANGES_STREAM, count=1)
+        return entries[0][0] if entries else "0"
+
+    def get_changes(self, since: str, limit: int = 500) -> Dict[str, Any]:
+        """
+        Obtiene los eventos posteriores a `since`. Si ya se descartaron eventos
+        posteriores a `since`, devuelve reset=True y el cliente debe recargar
+        el catálogo completo.
+        """
+        ms, seq = _parse_stream_id(since)
+        trimmed = self.redis_client.get(BOOK_CHANGES_TRIMMED_KEY)
+        if trimmed and (ms, seq) < _parse_stream_id(trimmed):
+            return {"events": [], "last_id": self.get_changes_cursor(), "reset": True}
+
+        entries = self.redis_client.xrange(BOOK_CHANGES_STREAM, min=f"({ms}-{seq}", count=limit)
+        events = [self._format_change(entry_id, fields) for entry_id, fields in entries]
+        return {
+            "events": events,
+            "last_id": events[-1]["id"] if events else since,
+            "reset": False
+        }
+
+    @property
+    def async_redis_client(self) -> AsyncRedis:
+        """Cliente asíncrono para lecturas bloqueantes (se crea al primer uso)."""
+        if self._async_redis_client is None:
+            self._async_redis_client = AsyncRedis(
+                host=self.redis_host,
+                port=self.redis_port,
+                decode_responses=True,
+                socket_connect_timeout=3
+            )
+        return self._async_redis_client
+
+    async def wait_for_changes(self, since: str, block_ms: int = 15000) -> List[Dict[str, Any]]:
+        """Espera, sin bloquear el event loop, eventos posteriores a `since`."""
+        response = await self.async_redis_client.xread({BOOK_CHANGES_STREAM: since}, block=block_ms)
+        if not response:
+            return []
+        _, entries = response[0]
+        return [self._format_change(entry_id, fields) for entry_id, fields in entries]
+
+    async def aclose(self):
+        """Cierra el cliente asíncrono, si se llegó a crear."""
+        if self._async_redis_client is not None:
+            await self._async_redis_client.aclose()
+            self._async_redis_client = None
+
     def get_book(self, book_id: str) -> Optional[Dict[str, Any]]:
         """Obtiene un libro de Redis por su ID."""
         try:
@@ -80,7 +267,14 @@ class RedisService:
     def delete_book(self, book_id: str) -> bool:
         """Elimina un libro de Redis."""
         try:
-            return bool(self.redis_client.delete(f"book:{book_id}"))
+            if not self.redis_client.exists(f"book:{book_id}"):
+                return False
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.delete(f"book:{book_id}")
+            pipe.srem(BOOK_IDS_KEY, book_id)
+            self._append_change(pipe, 'removed', book_id)
+            deleted, _, _ = pipe.execute()
+            return bool(deleted)
         except Exception as e:
             print(f"Error al eliminar libro: {str(e)}")
             return False 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 class BookBase(BaseModel):
@@ -24,4 +24,15 @@ class BookSearchParams(BaseModel):
     title: Optional[str] = Field(None, description="Filtrar por título")
     category: Optional[str] = Field(None, description="Filtrar por categoría")
     min_price: Optional[float] = Field(None, description="Precio mínimo", ge=0)
-    max_price: Optional[float] = Field(None, description="Precio máximo", ge=0) 
\ No newline at end of file
+    max_price: Optional[float] = Field(None, description="Precio máximo", ge=0)
+
+class BookChange(BaseModel):
+    id: str = Field(..., description="ID del evento en el stream de cambios")
+    type: Literal["added", "updated", "removed"] = Field(..., description="Tipo de cambio")
+    book_id: str = Field(..., description="ID del libro afectado")
+    book: Optional[Book] = Field(None, description="Libro tras el cambio (vacío si se eliminó)")
+
+class BookChangeFeed(BaseModel):
+    events: List[BookChange] = Field(default_factory=list, description="Cambios posteriores a `since`")
+    last_id: str = Field(..., description="Cursor para la siguiente consulta")
+    reset: bool = Field(False, description="El cursor es demasiado antiguo: recargar el catálogo completo")
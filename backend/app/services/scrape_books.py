@@ -1,12 +1,8 @@
 import logging
-import json
-import hashlib
 import requests
 from bs4 import BeautifulSoup
-from redis import Redis
 import time
 from typing import Dict, List, Optional
-import os
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
@@ -20,14 +16,10 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class BookScraper:
-    def __init__(self, redis_host: str = None, redis_port: int = None):
+    def __init__(self):
         self.base_url = "https://books.toscrape.com"
-        
-        # Obtener configuración de Redis desde variables de entorno o usar valores por defecto
-        redis_host = redis_host or os.getenv('REDIS_HOST', 'localhost')
-        redis_port = redis_port or int(os.getenv('REDIS_PORT', '6379'))
-        
-        self.redis_client = Redis(host=redis_host, port=redis_port, decode_responses=True)
+        # Categorías scrapeadas sin errores de red en la última ejecución
+        self.scraped_categories: List[str] = []
         self.max_retries = 3
         self.retry_delay = 2
 
@@ -45,9 +37,6 @@ class BookScraper:
                     logger.error(f"No se pudo obtener la página {url} después de {self.max_retries} intentos")
                     return None
 
-    def _generate_book_id(self, title: str) -> str:
-        return hashlib.md5(title.encode()).hexdigest()
-
     def _parse_book_data(self, book_element,category) -> Dict:
         try:
             # Extraer título
@@ -114,6 +103,7 @@ class BookScraper:
         """Scrapea los libros de una categoría específica."""
         books_scraped = []
         page = 1
+        complete = True
         
         while len(books_scraped) < max_books:
             # Construir URL de la página
@@ -128,6 +118,7 @@ class BookScraper:
             
             if not soup:
                 logger.error(f"No se pudo obtener la página {page}")
+                complete = False
                 break
 
             # Encontrar todos los elementos de libro en la página
@@ -144,13 +135,9 @@ class BookScraper:
 
                 book_data = self._parse_book_data(book_element,actual_category)
                 if book_data and book_data['price'] <= max_price:
-                    book_id = self._generate_book_id(book_data['title'])
-                    self.redis_client.set(
-                        f"book:{book_id}",
-                        json.dumps(book_data)
-                    )
+                    # El almacenamiento en Redis lo hace RedisService.store_books
                     books_scraped.append(book_data)
-                    logger.info(f"Libro guardado: {book_data['title']} - £{book_data['price']}")
+                    logger.info(f"Libro encontrado: {book_data['title']} - £{book_data['price']}")
 
             # Verificar si hay una página siguiente
             next_page = soup.find('li', class_='next')
@@ -160,11 +147,14 @@ class BookScraper:
                 
             page += 1
 
+        if complete and actual_category:
+            self.scraped_categories.append(actual_category)
         return books_scraped
 
     def scrape_books(self, max_books_per_category: int = 20, max_price: float = 20.0) -> List[Dict]:
         """Scrapea libros de todas las categorías disponibles."""
         all_books = []
+        self.scraped_categories = []
         
         # Obtener todas las categorías
         categories = self.get_categories()
@@ -190,5 +180,5 @@ class BookScraper:
         return all_books
 
 if __name__ == "__main__":
-    scraper = BookScraper()
-    scraper.scrape_books() 
\ No newline at end of file
+    from app.worker import main
+    main() 
\ No newline at end of file
@@ -1,11 +1,16 @@
 import logging
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from queue import Empty, Queue
 from typing import List, Dict, Optional
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -18,139 +23,303 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Recursos que no necesitamos para leer el DOM y que solo alargan la carga
+BLOCKED_URLS = [
+    "*.css", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp",
+    "*.woff", "*.woff2", "*.ttf",
+]
+
+# Extrae todas las historias de la página en una sola llamada a WebDriver
+EXTRACT_STORIES_JS = """
+return Array.from(document.querySelectorAll('tr.athing')).map(function (row) {
+    var titleLink = row.querySelector('span.titleline > a');
+    var subtext = row.nextElementSibling;
+    var pick = function (selector) {
+        return subtext ? subtext.querySelector(selector) : null;
+    };
+    var score = pick('.score');
+    var author = pick('.hnuser');
+    var age = pick('.age');
+    var comments = null;
+    if (subtext) {
+        var links = subtext.querySelectorAll('a');
+        for (var i = 0; i < links.length; i++) {
+            if (links[i].textContent.toLowerCase().indexOf('comment') !== -1) {
+                comments = links[i].textContent;
+                break;
+            }
+        }
+    }
+    return {
+        title: titleLink ? titleLink.textContent : null,
+        url: titleLink ? titleLink.href : null,
+        score: score ? score.textContent : null,
+        author: author ? author.textContent : null,
+        time_posted: age ? age.getAttribute('title') : null,
+        comments: comments
+    };
+});
+"""
+
+
+def create_driver() -> webdriver.Chrome:
+    """Crea un Chrome headless que no descarga imágenes, CSS ni fuentes."""
+    chrome_options = Options()
+    chrome_options.add_argument('--headless=new')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--disable-software-rasterizer')
+    chrome_options.add_argument('--use-gl=swiftshader')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.managed_default_content_settings.stylesheets': 2,
+        'profile.managed_default_content_settings.fonts': 2,
+    })
+    # No esperar a subrecursos: basta con que el DOM esté listo
+    chrome_options.page_load_strategy = 'eager'
+
+    service = Service(ChromeDriverManager().install())
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.set_page_load_timeout(30)
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URLS})
+    except WebDriverException as e:
+        logger.warning(f"No se pudo activar el bloqueo de recursos: {str(e)}")
+    return driver
+
+
+class WebDriverPool:
+    """Pool de sesiones de Chrome reutilizables entre refrescos."""
+
+    def __init__(self, size: int = 3):
+        if size < 1:
+            raise ValueError("El tamaño del pool debe ser al menos 1")
+        self.size = size
+        self._drivers: List[webdriver.Chrome] = []
+        self._available: Queue = Queue()
+        self._lock = threading.Lock()
+        # Huecos reservados cuyas sesiones se están arrancando
+        self._pending = 0
+        self._closed = False
+
+    def warm_up(self):
+        """Arranca las sesiones que falten en el pool."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("El pool de drivers está cerrado")
+            missing = self.size - len(self._drivers) - self._pending
+            if missing <= 0:
+                return
+            # Reservar los huecos antes de soltar el lock para no arrancar sesiones de más
+            self._pending += missing
+
+        # Chrome tarda en arrancar: se crea fuera del lock
+        logger.info(f"Iniciando {missing} sesiones de Chrome para el pool")
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            futures = [executor.submit(create_driver) for _ in range(missing)]
+        for future in futures:
+            try:
+                driver = future.result()
+            except Exception as e:
+                logger.error(f"No se pudo iniciar una sesión de Chrome: {str(e)}")
+                driver = None
+            self._fill_slot(driver)
+
+        with self._lock:
+            if not self._drivers and not self._pending:
+                raise RuntimeError("No se pudo iniciar ninguna sesión de Chrome")
+
+    def _fill_slot(self, driver: Optional[webdriver.Chrome]):
+        """Ocupa un hueco reservado con `driver`, o lo libera si es None."""
+        with self._lock:
+            self._pending -= 1
+            if driver is None:
+                return
+            if self._closed:
+                driver.quit()
+                return
+            self._drivers.append(driver)
+            self._available.put(driver)
+
+    @contextmanager
+    def acquire(self):
+        """
+        Presta un driver del pool y lo devuelve al terminar. Si el bloque
+        lanza una excepción, la sesión se descarta y se sustituye por otra.
+        """
+        self.warm_up()
+        while True:
+            try:
+                driver = self._available.get(timeout=1)
+                break
+            except Empty:
+                # Si se descartaron sesiones sin reemplazo, volver a rellenar el pool
+                self.warm_up()
+        healthy = False
+        try:
+            yield driver
+            healthy = True
+        finally:
+            if healthy:
+                self._release(driver)
+            else:
+                self._retire(driver)
+
+    def _release(self, driver: webdriver.Chrome):
+        with self._lock:
+            if not self._closed:
+                self._available.put(driver)
+
+    def _retire(self, driver: webdriver.Chrome):
+        """Cierra una sesión posiblemente inservible y ocupa su hueco con una nueva."""
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            if self._closed:
+                return
+            self._pending += 1
+        try:
+            new_driver = create_driver()
+        except Exception as e:
+            # El hueco queda libre y warm_up lo intentará rellenar más adelante
+            logger.error(f"No se pudo reemplazar la sesión de Chrome: {str(e)}")
+            new_driver = None
+        self._fill_slot(new_driver)
+
+    def close(self):
+        """Cierra todas las sesiones. Los drivers prestados no se devuelven a la cola."""
+        with self._lock:
+            self._closed = True
+            for driver in self._drivers:
+                try:
+                    driver.quit()
+                except Exception as e:
+                    logger.error(f"Error al cerrar el driver: {str(e)}")
+            self._drivers = []
+
+
+_shared_pool: Optional[WebDriverPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> WebDriverPool:
+    """Devuelve el pool compartido del proceso, creándolo si hace falta."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = WebDriverPool(size=int(os.getenv('HN_DRIVER_POOL_SIZE', '3')))
+        return _shared_pool
+
+
+def close_driver_pool():
+    """Cierra el pool compartido, si existe."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.close()
+            _shared_pool = None
+
+
 class HackerNewsScraper:
-    def __init__(self):
+    def __init__(self, pool: Optional[WebDriverPool] = None):
         self.base_url = "https://news.ycombinator.com"
         self.max_retries = 3
         self.retry_delay = 2
-        self.driver = None
-        self.setup_driver()
+        self.pool = pool or get_driver_pool()
+        self.pool.warm_up()
 
-    def setup_driver(self):
-        try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless=new')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--disable-software-rasterizer')
-            chrome_options.add_argument('--use-gl=swiftshader')
-            chrome_options.add_argument('--window-size=1920,1080')
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.set_page_load_timeout(30)
-            self.wait = WebDriverWait(self.driver, 15)
-        except Exception as e:
-            logger.error(f"Error al configurar el driver: {str(e)}")
-            raise
-
-    def _make_request(self, url: str) -> bool:
+    def _make_request(self, driver: webdriver.Chrome, url: str) -> bool:
+        wait = WebDriverWait(driver, 15)
         for attempt in range(self.max_retries):
             try:
-                self.driver.get(url)
+                driver.get(url)
                 # Esperar a que al menos un elemento de historia esté presente
-                self.wait.until(
+                wait.until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, "tr.athing"))
                 )
                 return True
-            except Exception as e:
+            except TimeoutException as e:
+                # Otros WebDriverException (sesión caída) se propagan para descartar el driver
                 logger.error(f"Error en intento {attempt + 1}: {str(e)}")
                 if attempt < self.max_retries - 1:
                     time.sleep(self.retry_delay)
         return False
 
-    def _parse_story(self, story_element) -> Optional[Dict]:
+    def _parse_story(self, row: Dict) -> Optional[Dict]:
         try:
-            # Obtener título y URL
-            title_element = story_element.find_element(By.CSS_SELECTOR, "span.titleline > a")
-            title = title_element.text
-            url = title_element.get_attribute("href")
-            
-            # Obtener información de la fila siguiente (subtext)
-            subtext_element = story_element.find_element(By.XPATH, "./following-sibling::tr")
-            
+            if not row.get("title"):
+                return None
+
             # Obtener puntuación
             score = 0
-            try:
-                score_element = subtext_element.find_element(By.CLASS_NAME, "score")
-                score = int(score_element.text.split()[0])
-            except NoSuchElementException:
-                pass
-            
-            # Obtener autor
-            author = "Unknown"
-            try:
-                author_element = subtext_element.find_element(By.CLASS_NAME, "hnuser")
-                author = author_element.text
-            except NoSuchElementException:
-                pass
-            
-            # Obtener tiempo de publicación
-            time_posted = "Unknown"
-            try:
-                time_element = subtext_element.find_element(By.CLASS_NAME, "age")
-                time_posted = time_element.get_attribute("title")
-            except NoSuchElementException:
-                pass
-            
+            if row.get("score"):
+                score = int(row["score"].split()[0])
+
             # Obtener número de comentarios
             comments = 0
-            try:
-                links = subtext_element.find_elements(By.TAG_NAME, "a")
-                for link in links:
-                    if "comment" in link.text.lower():
-                        comments_text = link.text.split()[0]
-                        comments = int(comments_text) if comments_text.isdigit() else 0
-                        break
-            except (NoSuchElementException, ValueError):
-                pass
-            
+            if row.get("comments"):
+                comments_text = row["comments"].split()[0]
+                comments = int(comments_text) if comments_text.isdigit() else 0
+
             return {
-                "title": title,
-                "url": url,
+                "title": row["title"],
+                "url": row.get("url"),
                 "score": score,
-                "author": author,
-                "time_posted": time_posted,
+                "author": row.get("author") or "Unknown",
+                "time_posted": row.get("time_posted") or "Unknown",
                 "comments": comments,
                 "fetched_at": datetime.now().isoformat()
             }
-        except Exception as e:
+        except (AttributeError, IndexError, ValueError) as e:
             logger.error(f"Error al parsear historia: {str(e)}")
             return None
 
+    def _scrape_page(self, page: int) -> List[Dict]:
+        url = f"{self.base_url}/news?p={page}" if page > 1 else self.base_url
+        logger.info(f"Scrapeando página {page}: {url}")
+
+        stories = []
+        try:
+            with self.pool.acquire() as driver:
+                if not self._make_request(driver, url):
+                    logger.error(f"No se pudo cargar la página {page}")
+                    return stories
+                rows = driver.execute_script(EXTRACT_STORIES_JS) or []
+        except Exception as e:
+            logger.error(f"Error en la página {page}: {str(e)}")
+            return stories
+
+        for row in rows:
+            story_data = self._parse_story(row)
+            if story_data:
+                stories.append(story_data)
+                logger.info(f"Historia encontrada: {story_data['title']} (Score: {story_data['score']})")
+        return stories
+
     def get_top_stories(self, max_pages: int = 5) -> List[Dict]:
         stories = []
-        
-        for page in range(1, max_pages + 1):
-            url = f"{self.base_url}/news?p={page}" if page > 1 else self.base_url
-            
-            logger.info(f"Scrapeando página {page}: {url}")
-            
-            if not self._make_request(url):
-                logger.error(f"No se pudo cargar la página {page}")
-                continue
 
-            try:
-                # Obtener todas las historias (filas con clase 'athing')
-                story_elements = self.driver.find_elements(By.CSS_SELECTOR, "tr.athing")
-                
-                for story_element in story_elements:
-                    story_data = self._parse_story(story_element)
-                    if story_data:
-                        stories.append(story_data)
-                        logger.info(f"Historia encontrada: {story_data['title']} (Score: {story_data['score']})")
-
-            except WebDriverException as e:
-                logger.error(f"Error en la página {page}: {str(e)}")
-                continue
+        # Las páginas se cargan en paralelo, tantas como sesiones tenga el pool
+        with ThreadPoolExecutor(max_workers=min(self.pool.size, max_pages)) as executor:
+            for page_stories in executor.map(self._scrape_page, range(1, max_pages + 1)):
+                stories.extend(page_stories)
 
         logger.info(f"Total de historias encontradas: {len(stories)}")
         return stories
 
     def close(self):
-        if self.driver:
-            self.driver.quit()
+        """
+        No cierra el pool: el compartido vive mientras dure el proceso y se
+        cierra con close_driver_pool(); uno propio lo cierra quien lo creó.
+        """
 
 if __name__ == "__main__":
     scraper = None
@@ -170,4 +339,5 @@ if __name__ == "__main__":
         logger.error(f"Error en la ejecución: {str(e)}")
     finally:
         if scraper:
-            scraper.close()
\ No newline at end of file
+            scraper.close()
+        close_driver_pool()
\ No newline at end of file
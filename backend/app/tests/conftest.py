@@ -0,0 +1,15 @@
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from app.core.redis import RedisService
+
+
+@pytest.fixture
+def redis_service():
+    """RedisService sobre un servidor fakeredis compartido por los clientes síncrono y asíncrono."""
+    server = fakeredis.FakeServer()
+    service = RedisService()
+    service.redis_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    service._async_redis_client = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    return service
@@ -1,7 +1,12 @@
 import pytest
+from fastapi import Request
 from fastapi.testclient import TestClient
+import asyncio
 import json
-from app.api.main import app
+import subprocess
+import sys
+from app.api.main import app, get_book_scraper_service, get_redis_service, stream_book_changes
+from app.core import redis as redis_module
 
 client = TestClient(app)
 
@@ -69,6 +74,181 @@ def test_get_books():
     for book in books:
         assert book["category"] == "fiction"
 
+@pytest.fixture
+def api_redis_service(redis_service):
+    """Sirve la API sobre el RedisService de fakeredis."""
+    app.dependency_overrides[get_redis_service] = lambda: redis_service
+    yield redis_service
+    app.dependency_overrides.clear()
+
+class StubScraper:
+    """BookScraper que devuelve un resultado fijo sin acceder a la red."""
+
+    def __init__(self, books, scraped_categories):
+        self.books = books
+        self.scraped_categories = scraped_categories
+
+    def scrape_books(self, **kwargs):
+        return [dict(book) for book in self.books]
+
+def test_init_scraping_refuses_empty_result(api_redis_service):
+    """Un scraping sin resultados devuelve error y no vacía el catálogo."""
+    api_redis_service.store_books([{"title": "Libro A", "price": 10.0, "category": "Poetry"}])
+    cursor = api_redis_service.get_changes_cursor()
+    app.dependency_overrides[get_book_scraper_service] = lambda: StubScraper([], [])
+
+    response = client.post("/init")
+
+    assert response.status_code == 502
+    assert api_redis_service.get_changes(cursor)["events"] == []
+    assert len(api_redis_service.redis_client.smembers(redis_module.BOOK_IDS_KEY)) == 1
+
+def test_init_scraping_reports_stored_books(api_redis_service):
+    """El mensaje de /init indica los libros realmente almacenados."""
+    books = [
+        {"title": "Libro A", "price": 10.0, "category": "Poetry"},
+        {"title": "Libro A", "price": 11.0, "category": "Poetry"},
+        {"title": "Libro B", "price": 12.0, "category": "Fiction"},
+    ]
+    app.dependency_overrides[get_book_scraper_service] = lambda: StubScraper(
+        books, ["Poetry", "Fiction"]
+    )
+
+    response = client.post("/init")
+
+    assert response.status_code == 200
+    assert response.json()["message"] == "2 libros scrapeados y almacenados"
+
+def test_get_book_changes(api_redis_service):
+    """Prueba el feed de cambios del catálogo."""
+    redis_service = api_redis_service
+    # Sin cursor solo se devuelve el cursor actual
+    response = client.get("/books/changes")
+    assert response.status_code == 200
+    feed = response.json()
+    assert feed["events"] == []
+    assert feed["reset"] is False
+    cursor = feed["last_id"]
+
+    # El listado de libros expone el cursor desde el que seguir los cambios
+    response = client.get("/books")
+    assert response.status_code == 200
+    assert "x-changes-cursor" in response.headers
+
+    # Con cursor se devuelven solo los cambios posteriores
+    redis_service.store_books([{"title": "Libro A", "price": 10.0, "category": "Poetry"}])
+    response = client.get(f"/books/changes?since={cursor}")
+    assert response.status_code == 200
+    feed = response.json()
+    assert [(e["type"], e["book"]["title"]) for e in feed["events"]] == [("added", "Libro A")]
+    assert feed["last_id"] == redis_service.get_changes_cursor()
+
+    # Cursor con formato inválido
+    response = client.get("/books/changes?since=abc")
+    assert response.status_code == 422
+
+class FakeRequest:
+    """Request que se desconecta tras `polls` comprobaciones."""
+
+    def __init__(self, polls: int = 0):
+        self.polls = polls
+
+    async def is_disconnected(self) -> bool:
+        self.polls -= 1
+        return self.polls < 0
+
+
+def collect_stream(redis_service, since=None, polls=0):
+    """Ejecuta el endpoint SSE y devuelve los fragmentos emitidos."""
+    async def run():
+        response = await stream_book_changes(
+            request=FakeRequest(polls), since=since, last_event_id=None,
+            redis_service=redis_service
+        )
+        return [chunk async for chunk in response.body_iterator]
+    return asyncio.run(run())
+
+def test_stream_book_changes_framing(redis_service):
+    """El stream SSE emite un evento por cambio con su ID y termina al desconectarse."""
+    redis_service.store_books([
+        {"title": "Libro A", "price": 10.0, "category": "Poetry", "image_url": ""},
+        {"title": "Libro B", "price": 12.0, "category": "Fiction", "image_url": ""},
+    ])
+    events = redis_service.get_changes("0")["events"]
+
+    chunks = collect_stream(redis_service, since="0")
+    assert len(chunks) == 2
+    for chunk, event in zip(chunks, events):
+        header, data, blank = chunk.split("\n", 2)
+        assert header == f"id: {event['id']}"
+        assert blank == "\n"
+        payload = json.loads(data[len("data: "):])
+        assert payload["type"] == "added"
+        assert payload["book_id"] == event["book_id"]
+        assert payload["book"]["title"] == event["book"]["title"]
+
+def test_stream_book_changes_waits_for_new_events(redis_service):
+    """Tras ponerse al día, el stream entrega los eventos nuevos leídos con XREAD."""
+    redis_service.store_books([{"title": "Libro A", "price": 10.0, "category": "Poetry"}])
+    cursor = redis_service.get_changes_cursor()
+
+    async def run():
+        response = await stream_book_changes(
+            request=FakeRequest(polls=1), since=cursor, last_event_id=None,
+            redis_service=redis_service
+        )
+        # El cambio se escribe mientras el stream espera en XREAD
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.2, redis_service.store_books,
+                        [{"title": "Libro A", "price": 11.0, "category": "Poetry"}])
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.run(run())
+    assert len(chunks) == 1
+    assert json.loads(chunks[0].split("\n")[1][len("data: "):])["type"] == "updated"
+
+def test_stream_book_changes_reset(redis_service, monkeypatch):
+    """Si el cursor se quedó sin historia, el stream emite un evento 'reset'."""
+    monkeypatch.setattr(redis_module, "BOOK_CHANGES_MAXLEN", 1)
+    redis_service.store_books([
+        {"title": "Libro A", "price": 10.0, "category": "Poetry"},
+        {"title": "Libro B", "price": 12.0, "category": "Fiction"},
+    ])
+    chunks = collect_stream(redis_service, since="0")
+    assert chunks == [f"id: {redis_service.get_changes_cursor()}\nevent: reset\ndata: {{}}\n\n"]
+
+def test_stream_book_changes_route(api_redis_service, monkeypatch):
+    """La ruta SSE respeta Last-Event-ID y responde como text/event-stream."""
+    api_redis_service.store_books([
+        {"title": "Libro A", "price": 10.0, "category": "Poetry"},
+        {"title": "Libro B", "price": 12.0, "category": "Fiction"},
+    ])
+    first, second = api_redis_service.get_changes("0")["events"]
+
+    # TestClient no puede desconectarse: el stream termina tras ponerse al día
+    async def disconnected(self):
+        return True
+
+    monkeypatch.setattr(Request, "is_disconnected", disconnected)
+
+    response = client.get(
+        "/books/changes/stream?since=0", headers={"Last-Event-ID": first["id"]}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith(f"id: {second['id']}\ndata: ")
+    assert response.text.count("id: ") == 1
+
+    # Sin Last-Event-ID se parte de `since`
+    response = client.get("/books/changes/stream?since=0")
+    assert response.text.count("id: ") == 2
+
+def test_stream_book_changes_invalid_cursor(api_redis_service):
+    """Cursores con formato inválido se rechazan antes de abrir el stream."""
+    assert client.get("/books/changes/stream?since=abc").status_code == 422
+    response = client.get("/books/changes/stream", headers={"Last-Event-ID": "abc"})
+    assert response.status_code == 422
+
 def test_error_handling():
     """Prueba el manejo de errores."""
     # Prueba con un precio mínimo inválido
@@ -81,4 +261,15 @@ def test_error_handling():
     
     # Prueba con un número de páginas inválido para headlines
     response = client.get("/headlines?max_pages=0")
-    assert response.status_code == 422  # Error de validación 
\ No newline at end of file
+    assert response.status_code == 422  # Error de validación
+
+def test_api_does_not_import_scraper_dependencies():
+    """La API no debe cargar las dependencias de scraping al arrancar."""
+    code = (
+        "import sys, app.api.main; "
+        "print([m for m in ('requests', 'bs4', 'selenium', 'app.services.scrape_books') "
+        "if m in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,173 @@
+import json
+
+import pytest
+
+from app.core import redis as redis_module
+
+BOOK_A = {"title": "A Light in the Attic", "price": 10.0, "category": "Poetry", "image_url": ""}
+BOOK_B = {"title": "Tipping the Velvet", "price": 15.0, "category": "Fiction", "image_url": ""}
+BOOK_C = {"title": "Soumission", "price": 12.0, "category": "Fiction", "image_url": ""}
+
+
+def book_id(book):
+    return redis_module.RedisService.generate_book_id(book["title"], book["category"])
+
+
+def changes(redis_service, since="0"):
+    """Devuelve los cambios como tuplas (tipo, book_id) y el cursor final."""
+    feed = redis_service.get_changes(since)
+    return [(e["type"], e["book_id"]) for e in feed["events"]], feed["last_id"]
+
+
+def test_store_books_emits_added_events(redis_service):
+    """La primera ingesta registra un evento 'added' por libro."""
+    assert redis_service.store_books([dict(BOOK_A), dict(BOOK_B)]) == 2
+
+    events, _ = changes(redis_service)
+    assert events == [("added", book_id(BOOK_A)), ("added", book_id(BOOK_B))]
+    stored = redis_service.get_book(book_id(BOOK_A))
+    assert stored == {**BOOK_A, "id": book_id(BOOK_A)}
+
+
+def test_store_books_emits_diff_only(redis_service):
+    """Una segunda ingesta solo registra los libros añadidos, modificados y eliminados."""
+    redis_service.store_books([dict(BOOK_A), dict(BOOK_B)])
+    cursor = redis_service.get_changes_cursor()
+
+    updated_b = {**BOOK_B, "price": 9.5}
+    redis_service.store_books([dict(BOOK_C), dict(BOOK_A), updated_b])
+
+    events, _ = changes(redis_service, cursor)
+    assert events == [("added", book_id(BOOK_C)), ("updated", book_id(BOOK_B))]
+    feed = redis_service.get_changes(cursor)
+    assert feed["events"][1]["book"]["price"] == 9.5
+
+    cursor = redis_service.get_changes_cursor()
+    redis_service.store_books([dict(BOOK_C), updated_b], categories=["Poetry", "Fiction"])
+    events, _ = changes(redis_service, cursor)
+    assert events == [("removed", book_id(BOOK_A))]
+    assert redis_service.get_book(book_id(BOOK_A)) is None
+
+
+def test_store_books_unchanged_catalog_emits_nothing(redis_service):
+    """Reingestar el mismo catálogo no genera eventos."""
+    redis_service.store_books([dict(BOOK_A), dict(BOOK_B)])
+    cursor = redis_service.get_changes_cursor()
+    redis_service.store_books([dict(BOOK_A), dict(BOOK_B)])
+    assert changes(redis_service, cursor) == ([], cursor)
+
+
+def test_store_books_removes_legacy_keys(redis_service):
+    """Sin índice de IDs, las claves book:* existentes se consideran parte del catálogo."""
+    redis_service.redis_client.set("book:0", json.dumps({**BOOK_A, "id": "0"}))
+    redis_service.store_books([dict(BOOK_A)])
+
+    events, _ = changes(redis_service)
+    assert events == [("added", book_id(BOOK_A)), ("removed", "0")]
+    assert redis_service.get_book("0") is None
+
+
+def test_store_books_refuses_empty_result(redis_service):
+    """Un scraping vacío no vacía el catálogo ni genera eventos."""
+    redis_service.store_books([dict(BOOK_A), dict(BOOK_B)])
+    cursor = redis_service.get_changes_cursor()
+
+    with pytest.raises(ValueError):
+        redis_service.store_books([])
+
+    assert changes(redis_service, cursor) == ([], cursor)
+    assert redis_service.get_book(book_id(BOOK_A)) is not None
+    assert redis_service.get_book(book_id(BOOK_B)) is not None
+
+
+def test_store_books_only_removes_scraped_categories(redis_service):
+    """Solo se eliminan libros de las categorías que se scrapearon por completo."""
+    redis_service.store_books([dict(BOOK_A), dict(BOOK_B), dict(BOOK_C)])
+    cursor = redis_service.get_changes_cursor()
+
+    # Poetry falló: A se conserva aunque no esté en el resultado
+    redis_service.store_books([dict(BOOK_B)], categories=["Fiction"])
+    events, cursor = changes(redis_service, cursor)
+    assert events == [("removed", book_id(BOOK_C))]
+    assert redis_service.get_book(book_id(BOOK_A)) is not None
+
+    # Sin lista explícita se usan las categorías presentes en el resultado
+    redis_service.store_books([dict(BOOK_B)])
+    assert changes(redis_service, cursor) == ([], cursor)
+
+    redis_service.store_books([dict(BOOK_B)], categories=["Poetry", "Fiction"])
+    assert changes(redis_service, cursor)[0] == [("removed", book_id(BOOK_A))]
+
+
+def test_store_books_duplicate_titles(redis_service):
+    """El ID incluye la categoría; títulos repetidos en la misma categoría se fusionan."""
+    same_title_other_category = {**BOOK_A, "category": "Classics"}
+    duplicate = {**BOOK_A, "price": 11.0}
+
+    stored = redis_service.store_books(
+        [dict(BOOK_A), same_title_other_category, duplicate]
+    )
+
+    assert stored == 2
+    assert redis_service.get_book(book_id(BOOK_A))["price"] == 11.0
+    assert redis_service.get_book(book_id(same_title_other_category)) is not None
+
+
+def test_store_books_retries_on_concurrent_ingest(redis_service, monkeypatch):
+    """Si otra ingesta cambia el catálogo a mitad, se reintenta sin duplicar eventos."""
+    other = redis_module.RedisService()
+    other.redis_client = redis_service.redis_client
+    original_catalog_ids = redis_module.RedisService._catalog_ids
+    calls = []
+
+    def catalog_ids_with_concurrent_ingest(pipe):
+        ids = original_catalog_ids(pipe)
+        if not calls:
+            calls.append(True)
+            # Ingesta concurrente entre la lectura y el MULTI
+            other.store_books([dict(BOOK_A)])
+        return ids
+
+    monkeypatch.setattr(redis_module.RedisService, "_catalog_ids",
+                        staticmethod(catalog_ids_with_concurrent_ingest))
+    redis_service.store_books([dict(BOOK_A), dict(BOOK_B)])
+
+    events, _ = changes(redis_service)
+    assert events == [("added", book_id(BOOK_A)), ("added", book_id(BOOK_B))]
+
+
+def test_delete_book_emits_removed(redis_service):
+    """Eliminar un libro registra un evento 'removed'."""
+    redis_service.store_books([dict(BOOK_A)])
+    cursor = redis_service.get_changes_cursor()
+    assert redis_service.delete_book(book_id(BOOK_A)) is True
+    assert redis_service.delete_book(book_id(BOOK_A)) is False
+    assert changes(redis_service, cursor)[0] == [("removed", book_id(BOOK_A))]
+
+
+def test_get_changes_pages_with_exclusive_cursor(redis_service):
+    """El cursor es exclusivo: cada página empieza tras el último evento devuelto."""
+    redis_service.store_books([dict(BOOK_A), dict(BOOK_B), dict(BOOK_C)])
+
+    first = redis_service.get_changes("0", limit=2)
+    assert [e["book_id"] for e in first["events"]] == [book_id(BOOK_A), book_id(BOOK_B)]
+    second = redis_service.get_changes(first["last_id"], limit=2)
+    assert [e["book_id"] for e in second["events"]] == [book_id(BOOK_C)]
+    third = redis_service.get_changes(second["last_id"], limit=2)
+    assert third == {"events": [], "last_id": second["last_id"], "reset": False}
+
+
+def test_get_changes_reset_after_trim(redis_service, monkeypatch):
+    """Solo se pide recargar si se descartaron eventos posteriores al cursor."""
+    monkeypatch.setattr(redis_module, "BOOK_CHANGES_MAXLEN", 2)
+    redis_service.store_books([dict(BOOK_A), dict(BOOK_B), dict(BOOK_C)])
+    trimmed_id = redis_service.redis_client.get(redis_module.BOOK_CHANGES_TRIMMED_KEY)
+    assert redis_service.redis_client.xlen(redis_module.BOOK_CHANGES_STREAM) == 2
+
+    feed = redis_service.get_changes("0")
+    assert feed["reset"] is True
+    assert feed["last_id"] == redis_service.get_changes_cursor()
+
+    # El cursor del último evento descartado no se ha perdido nada
+    events, _ = changes(redis_service, trimmed_id)
+    assert events == [("added", book_id(BOOK_B)), ("added", book_id(BOOK_C))]
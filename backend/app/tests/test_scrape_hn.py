@@ -0,0 +1,239 @@
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from app.services import scrape_hn
+from app.services.scrape_hn import HackerNewsScraper, WebDriverPool
+
+
+class FakeDriver:
+    """Driver mínimo para probar el pool sin lanzar Chrome."""
+
+    def __init__(self, rows=None, fail_on_get=False):
+        self.rows = rows or []
+        self.fail_on_get = fail_on_get
+        self.quit_called = False
+        self.current_url = None
+
+    def get(self, url):
+        if self.fail_on_get:
+            raise WebDriverException("invalid session id")
+        self.current_url = url
+
+    def execute_script(self, script):
+        if isinstance(self.rows, dict):
+            return self.rows[self.current_url]
+        return self.rows
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def created_drivers(monkeypatch):
+    """Sustituye create_driver y registra los drivers creados."""
+    drivers = []
+
+    def fake_create_driver():
+        driver = FakeDriver()
+        drivers.append(driver)
+        return driver
+
+    monkeypatch.setattr(scrape_hn, "create_driver", fake_create_driver)
+    return drivers
+
+
+@pytest.fixture
+def scraper(created_drivers):
+    return HackerNewsScraper(pool=WebDriverPool(size=1))
+
+
+def test_parse_story_full_row(scraper):
+    """Prueba el parseo de una fila con todos los campos."""
+    story = scraper._parse_story({
+        "title": "Show HN: Algo",
+        "url": "https://example.com",
+        "score": "123 points",
+        "author": "pg",
+        "time_posted": "2024-01-01T12:00:00",
+        "comments": "45\xa0comments",
+    })
+    assert story["title"] == "Show HN: Algo"
+    assert story["url"] == "https://example.com"
+    assert story["score"] == 123
+    assert story["author"] == "pg"
+    assert story["time_posted"] == "2024-01-01T12:00:00"
+    assert story["comments"] == 45
+    assert "fetched_at" in story
+
+
+def test_parse_story_missing_fields(scraper):
+    """Sin puntuación, autor ni comentarios se usan los valores por defecto."""
+    story = scraper._parse_story({"title": "Anuncio", "url": "https://example.com"})
+    assert story["score"] == 0
+    assert story["comments"] == 0
+    assert story["author"] == "Unknown"
+    assert story["time_posted"] == "Unknown"
+
+
+def test_parse_story_discuss_link(scraper):
+    """Un enlace 'discuss' cuenta como cero comentarios."""
+    story = scraper._parse_story({"title": "Nuevo", "score": "1 point", "comments": "discuss"})
+    assert story["comments"] == 0
+
+
+def test_parse_story_empty_title(scraper):
+    """Las filas sin título se descartan."""
+    assert scraper._parse_story({"title": "", "score": "10 points"}) is None
+    assert scraper._parse_story({"title": None}) is None
+
+
+def test_pool_reuses_driver(created_drivers):
+    """Un driver devuelto sin errores se reutiliza."""
+    pool = WebDriverPool(size=1)
+    with pool.acquire() as first:
+        pass
+    with pool.acquire() as second:
+        pass
+    assert first is second
+    assert len(created_drivers) == 1
+
+
+def test_pool_replaces_failed_driver(created_drivers):
+    """Si el bloque falla, el driver se cierra y se sustituye."""
+    pool = WebDriverPool(size=1)
+    with pytest.raises(WebDriverException):
+        with pool.acquire() as driver:
+            raise WebDriverException("session deleted")
+    assert driver.quit_called
+    with pool.acquire() as replacement:
+        assert replacement is not driver
+    assert len(created_drivers) == 2
+
+
+def test_pool_drops_slot_when_replacement_fails(created_drivers, monkeypatch):
+    """Si no se puede crear el reemplazo, el driver caído no vuelve a la cola."""
+    pool = WebDriverPool(size=1)
+
+    def broken_create_driver():
+        raise RuntimeError("Chrome no arranca")
+
+    with pytest.raises(WebDriverException):
+        with pool.acquire() as driver:
+            monkeypatch.setattr(scrape_hn, "create_driver", broken_create_driver)
+            raise WebDriverException("session deleted")
+
+    # Se conserva el error original y el hueco queda libre
+    assert pool._drivers == []
+    assert pool._available.empty()
+    with pytest.raises(RuntimeError):
+        pool.warm_up()
+
+
+def test_pool_close_does_not_requeue_borrowed_driver(created_drivers):
+    """Tras cerrar el pool, los drivers prestados no vuelven a la cola."""
+    pool = WebDriverPool(size=1)
+    with pool.acquire():
+        pool.close()
+    assert pool._available.empty()
+    with pytest.raises(RuntimeError):
+        with pool.acquire():
+            pass
+
+
+def test_scrape_page_retires_dead_session(created_drivers):
+    """Una sesión caída en driver.get se descarta en lugar de volver al pool."""
+    pool = WebDriverPool(size=1)
+    scraper = HackerNewsScraper(pool=pool)
+    created_drivers[0].fail_on_get = True
+
+    assert scraper._scrape_page(1) == []
+    assert created_drivers[0].quit_called
+    assert pool._drivers == [created_drivers[1]]
+
+
+def test_close_keeps_shared_pool(created_drivers):
+    """Cerrar un scraper no cierra el pool compartido."""
+    scrape_hn.close_driver_pool()
+    try:
+        scraper = HackerNewsScraper()
+        scraper.close()
+        assert scrape_hn.get_driver_pool() is scraper.pool
+        with scraper.pool.acquire():
+            pass
+    finally:
+        scrape_hn.close_driver_pool()
+
+
+def test_retire_does_not_overfill_pool(created_drivers, monkeypatch):
+    """Un warm_up concurrente con un reemplazo no arranca sesiones de más."""
+    pool = WebDriverPool(size=1)
+    pool.warm_up()
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_create_driver():
+        started.set()
+        release.wait(timeout=5)
+        driver = FakeDriver()
+        created_drivers.append(driver)
+        return driver
+
+    monkeypatch.setattr(scrape_hn, "create_driver", slow_create_driver)
+
+    def fail_in_block():
+        with pytest.raises(WebDriverException):
+            with pool.acquire():
+                raise WebDriverException("session deleted")
+
+    retiring = threading.Thread(target=fail_in_block)
+    retiring.start()
+    assert started.wait(timeout=5)
+
+    # El hueco está reservado por el reemplazo en curso
+    pool.warm_up()
+    release.set()
+    retiring.join(timeout=5)
+
+    assert len(created_drivers) == 2
+    assert len(pool._drivers) == pool.size
+    assert pool._pending == 0
+
+
+def test_get_top_stories_parallel_in_page_order(created_drivers):
+    """Las páginas se cargan en paralelo y las historias conservan el orden de página."""
+    pool = WebDriverPool(size=2)
+    scraper = HackerNewsScraper(pool=pool)
+    urls = [scraper.base_url] + [f"{scraper.base_url}/news?p={page}" for page in (2, 3)]
+    rows = {
+        url: [{"title": f"p{page}-{i}", "score": "1 point"} for i in range(2)]
+        for page, url in enumerate(urls, start=1)
+    }
+    for driver in created_drivers:
+        driver.rows = rows
+
+    # Las dos primeras páginas solo avanzan si se cargan a la vez
+    barrier = threading.Barrier(2)
+    used = []
+
+    def fake_make_request(driver, url):
+        used.append(driver)
+        driver.get(url)
+        if url in urls[:2]:
+            barrier.wait(timeout=5)
+        if url == urls[0]:
+            # La primera página termina la última
+            time.sleep(0.1)
+        return True
+
+    scraper._make_request = fake_make_request
+    stories = scraper.get_top_stories(max_pages=3)
+
+    assert [story["title"] for story in stories] == [
+        "p1-0", "p1-1", "p2-0", "p2-1", "p3-0", "p3-1"
+    ]
+    assert len(set(map(id, used))) <= pool.size
+    assert len(created_drivers) == pool.size
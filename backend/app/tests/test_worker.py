@@ -0,0 +1,48 @@
+import pytest
+
+from app import worker
+
+
+class StubScraper:
+    """BookScraper sin red con un resultado fijo."""
+
+    books = []
+    scraped_categories = []
+
+    def scrape_books(self, **kwargs):
+        return [dict(book) for book in self.books]
+
+
+def test_worker_refuses_empty_result(redis_service, monkeypatch):
+    """Un scraping vacío hace fallar al worker sin tocar el catálogo."""
+    redis_service.store_books([{"title": "Libro A", "price": 10.0, "category": "Poetry"}])
+    cursor = redis_service.get_changes_cursor()
+    monkeypatch.setattr(worker, "RedisService", lambda: redis_service)
+    monkeypatch.setattr(worker, "BookScraper", StubScraper)
+
+    with pytest.raises(RuntimeError):
+        worker.run_book_scraping()
+    assert redis_service.get_changes(cursor)["events"] == []
+
+
+def test_worker_passes_scraped_categories(redis_service, monkeypatch):
+    """El worker solo elimina libros de las categorías scrapeadas."""
+    redis_service.store_books([
+        {"title": "Libro A", "price": 10.0, "category": "Poetry"},
+        {"title": "Libro B", "price": 12.0, "category": "Fiction"},
+    ])
+    cursor = redis_service.get_changes_cursor()
+
+    class PartialScraper(StubScraper):
+        books = [{"title": "Libro C", "price": 9.0, "category": "Fiction"}]
+        scraped_categories = ["Fiction"]
+
+    monkeypatch.setattr(worker, "RedisService", lambda: redis_service)
+    monkeypatch.setattr(worker, "BookScraper", PartialScraper)
+
+    assert worker.run_book_scraping() == 1
+    events = [(e["type"], e["book_id"]) for e in redis_service.get_changes(cursor)["events"]]
+    assert events == [
+        ("added", redis_service.generate_book_id("Libro C", "Fiction")),
+        ("removed", redis_service.generate_book_id("Libro B", "Fiction")),
+    ]
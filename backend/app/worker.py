@@ -0,0 +1,52 @@
+"""
+Worker de scraping independiente de la API.
+
+Ejecuta el scraping de libros y lo guarda en Redis sin levantar FastAPI:
+
+    python -m app.worker
+"""
+import argparse
+import logging
+
+from app.core.redis import RedisService
+from app.services.scrape_books import BookScraper
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def run_book_scraping(max_books_per_category: int = 20, max_price: float = 20.0) -> int:
+    """Scrapea los libros y los almacena en Redis. Devuelve cuántos se guardaron."""
+    redis_service = RedisService()
+    book_scraper = BookScraper()
+
+    logger.info("Iniciando scraping de libros...")
+    books = book_scraper.scrape_books(
+        max_books_per_category=max_books_per_category,
+        max_price=max_price
+    )
+    if not books:
+        # Un scraping fallido no debe vaciar el catálogo
+        raise RuntimeError("El scraping no devolvió libros; se conserva el catálogo actual")
+    stored = redis_service.store_books(books, categories=book_scraper.scraped_categories)
+    logger.info(f"Scraping completado. {stored} libros almacenados en Redis.")
+    return stored
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker de scraping de libros")
+    parser.add_argument("--max-books-per-category", type=int, default=20)
+    parser.add_argument("--max-price", type=float, default=20.0)
+    args = parser.parse_args()
+
+    run_book_scraping(
+        max_books_per_category=args.max_books_per_category,
+        max_price=args.max_price
+    )
+
+
+if __name__ == "__main__":
+    main()
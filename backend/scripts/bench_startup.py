@@ -0,0 +1,107 @@
+"""
+Mide el arranque de la API: tiempo de import, tiempo hasta responder y RSS.
+
+Uso (desde backend/):
+
+    python scripts/bench_startup.py --runs 5
+
+Requiere Linux (lee la memoria residente de /proc/<pid>/status).
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que un worker de solo lectura no debería cargar
+SCRAPER_MODULES = ["requests", "bs4", "selenium", "webdriver_manager", "app.services.scrape_books"]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def measure_import() -> float:
+    """Tiempo acumulado (ms) de `import app.api.main` según -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.api.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    for line in reversed(result.stderr.splitlines()):
+        match = re.match(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s+app\.api\.main$", line)
+        if match:
+            return int(match.group(1)) / 1000
+    raise RuntimeError("No se encontró app.api.main en la salida de -X importtime")
+
+
+def loaded_scraper_modules() -> list:
+    code = (
+        "import sys, app.api.main; "
+        f"print(','.join(m for m in {SCRAPER_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+def measure_uvicorn(timeout: float = 30.0) -> tuple:
+    """Arranca uvicorn y devuelve (segundos hasta responder, RSS en MB)."""
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.api.main:app", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR
+    )
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError("uvicorn terminó antes de estar listo")
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError("uvicorn no respondió a tiempo")
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/openapi.json", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.02)
+        ready = time.perf_counter() - start
+        return ready, _rss_kb(process.pid) / 1024
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de la API")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    startups = [measure_uvicorn() for _ in range(args.runs)]
+
+    print(f"import app.api.main: {statistics.median(imports):.1f} ms (mediana de {args.runs})")
+    print(f"uvicorn listo en:    {statistics.median(s[0] for s in startups) * 1000:.0f} ms")
+    print(f"RSS por worker:      {statistics.median(s[1] for s in startups):.1f} MB")
+    loaded = loaded_scraper_modules()
+    print(f"Dependencias de scraping cargadas: {', '.join(loaded) if loaded else 'ninguna'}")
+
+
+if __name__ == "__main__":
+    main()
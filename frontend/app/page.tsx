@@ -1,6 +1,6 @@
 "use client"
 
-import { useState, useEffect } from "react"
+import { useState, useEffect, useRef } from "react"
 import { Button } from "@/components/ui/button"
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card"
 import { Input } from "@/components/ui/input"
@@ -23,6 +23,25 @@ interface Book {
   created_at: string
 }
 
+// Evento del feed de cambios del catálogo (/books/changes/stream)
+interface BookChange {
+  id: string
+  type: "added" | "updated" | "removed"
+  book_id: string
+  book: Book | null
+}
+
+// Aplica un cambio a la lista de libros visible, respetando el filtro de categoría
+const applyBookChange = (books: Book[], change: BookChange, category: string): Book[] => {
+  const rest = books.filter((book) => book.id !== change.book_id)
+  if (change.type === "removed" || !change.book) return rest
+  if (category !== "all" && change.book.category.toLowerCase() !== category.toLowerCase()) return rest
+
+  const index = books.findIndex((book) => book.id === change.book_id)
+  if (index === -1) return [...books, change.book]
+  return books.map((book) => (book.id === change.book_id ? change.book! : book))
+}
+
 // Interfaz para los parámetros de búsqueda
 interface SearchParams {
   title?: string
@@ -40,6 +59,10 @@ export default function HomePage() {
   const [searchParams, setSearchParams] = useState<SearchParams>({})
   const [searchResults, setSearchResults] = useState<Book[]>([])
   const [searchLoading, setSearchLoading] = useState(false)
+  // Cursor del feed de cambios correspondiente a la última carga de libros
+  const [changesCursor, setChangesCursor] = useState<string | null>(null)
+  // Categoría actual para el stream de cambios, sin reabrir la conexión al cambiarla
+  const selectedCategoryRef = useRef(selectedCategory)
 
   const { toast } = useToast()
 
@@ -56,8 +79,10 @@ export default function HomePage() {
         title: "Scraping iniciado",
         description: "El proceso de scraping ha comenzado exitosamente",
       })
-      // Recargar los libros después del scraping
-      await fetchBooks()
+      // Sin actualizaciones en vivo, recargar los libros después del scraping
+      if (!changesCursor || typeof EventSource === "undefined") {
+        await fetchBooks(selectedCategory !== "all" ? selectedCategory : undefined)
+      }
     } catch (error) {
       console.error("Error al inicializar scraping:", error)
       toast({
@@ -79,6 +104,7 @@ export default function HomePage() {
 
       const response = await axios.get(url)
       setBooks(response.data)
+      setChangesCursor(response.headers?.["x-changes-cursor"] ?? null)
     } catch (error) {
       console.error("Error al obtener libros:", error)
       toast({
@@ -121,9 +147,31 @@ export default function HomePage() {
     fetchBooks()
   }, [])
 
+  // Aplicar en vivo los cambios del catálogo a partir del cursor de la última carga
+  useEffect(() => {
+    if (!changesCursor || typeof EventSource === "undefined") return
+
+    const source = new EventSource(`${API_BASE_URL}/books/changes/stream?since=${changesCursor}`)
+    source.onmessage = (event) => {
+      const change: BookChange = JSON.parse(event.data)
+      setBooks((prev) => applyBookChange(prev, change, selectedCategoryRef.current))
+    }
+    // El cursor es demasiado antiguo: recargar el catálogo completo
+    source.addEventListener("reset", () => {
+      source.close()
+      const category = selectedCategoryRef.current
+      fetchBooks(category !== "all" ? category : undefined)
+    })
+
+    return () => source.close()
+  }, [changesCursor])
+
   // Manejar cambio de categoría
   const handleCategoryChange = (category: string) => {
     setSelectedCategory(category)
+    selectedCategoryRef.current = category
+    // Cerrar el stream hasta que llegue el cursor de la nueva carga
+    setChangesCursor(null)
     if (category === "all") {
       fetchBooks()
     } else {